@@ -1,18 +1,25 @@
 import sys
 import os
+import html
+import random
 from datetime import datetime
+from functools import lru_cache
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, List
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QTextEdit, QLineEdit, QPushButton, 
                              QListWidget, QSplitter, QMenuBar, QMenu, QLabel,
                              QFileDialog, QColorDialog, QSystemTrayIcon, QComboBox,
-                             QListWidgetItem, QScrollArea)
-from PySide6.QtCore import Qt, QSize, Signal, QTimer, QMimeData
+                             QListWidgetItem, QScrollArea, QListView,
+                             QStyledItemDelegate, QGridLayout)
+from PySide6.QtCore import (Qt, QSize, Signal, QTimer, QMimeData,
+                            QAbstractListModel, QModelIndex, QRect,
+                            QRunnable, QThreadPool)
 from PySide6.QtGui import (QColor, QPalette, QFont, QIcon, QPixmap, QImage,
-                          QDrag, QTextCharFormat, QTextCursor, QTextImageFormat)
-from PySide6.QtCore import QObject, QEvent
+                          QDrag, QTextCharFormat, QTextCursor, QTextImageFormat,
+                          QPixmapCache, QPainter, QFontMetrics, QStaticText,
+                          QPainterPath, QShortcut, QKeySequence)
 
 
 class MessageType(Enum):
@@ -28,11 +35,70 @@ class Message:
     sender: str
     timestamp: datetime
     metadata: Optional[dict] = None
+    # Timestamps pre-formateados: strftime se paga una vez al crear el
+    # mensaje, no en cada repintado o exportación
+    short_ts: str = field(init=False)
+    long_ts: str = field(init=False)
+    # Contenido ya escapado para HTML; la exportación solo concatena
+    content_html: str = field(init=False)
+
+    def __post_init__(self):
+        self.short_ts = self.timestamp.strftime("%H:%M")
+        self.long_ts = self.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        self.content_html = html.escape(self.content).replace('\n', '<br>')
 
 class Theme:
     def __init__(self, name: str, colors: dict):
         self.name = name
         self.colors = colors
+        # QSS precomputada una sola vez; aplicar un tema es solo setStyleSheet
+        self.main_qss = f"""
+            QMainWindow, QWidget {{
+                background-color: {colors['background']};
+                color: {colors['text']};
+            }}
+
+            QLineEdit, QTextEdit {{
+                background-color: {colors['input']};
+                border-radius: 20px;
+                padding: 10px;
+                color: {colors['text']};
+            }}
+
+            QPushButton {{
+                background-color: {colors['accent']};
+                border-radius: 20px;
+                padding: 10px 20px;
+                color: white;
+                font-weight: bold;
+            }}
+
+            QPushButton:hover {{
+                background-color: {colors['hover']};
+            }}
+
+            QPushButton:pressed {{
+                background-color: {colors['pressed']};
+            }}
+
+            QListWidget {{
+                background-color: {colors['secondary']};
+                border-radius: 10px;
+                padding: 5px;
+            }}
+
+            QListWidget::item:hover {{
+                background-color: {colors['input']};
+            }}
+
+            QListWidget::item:selected {{
+                background-color: {colors['accent']};
+            }}
+
+            QScrollArea {{
+                border: none;
+            }}
+        """
 
 class Themes:
     DARK = Theme("Dark", {
@@ -75,77 +141,269 @@ class EmojiPanel(QWidget):
         
     def setup_ui(self):
         self.emoji_grid = QWidget()
-        grid_layout = QVBoxLayout(self.emoji_grid)
-        
+        grid_layout = QGridLayout(self.emoji_grid)
+
         # Común conjunto de emojis
         emojis = ["😀", "😂", "🤣", "😊", "😍", "🤔", "😎", "😭", "👍", "❤️",
                   "🎉", "✨", "🔥", "💯", "🙏", "👏", "🤝", "💪", "🌟", "⭐"]
-        
-        for i in range(0, len(emojis), 5):
-            row_widget = QWidget()
-            row_layout = QHBoxLayout(row_widget)
-            for emoji in emojis[i:i+5]:
-                btn = QPushButton(emoji)
-                btn.setFixedSize(40, 40)
-                btn.clicked.connect(lambda checked, e=emoji: self.emoji_selected.emit(e))
-                row_layout.addWidget(btn)
-            grid_layout.addWidget(row_widget)
-        
+
+        for i, emoji in enumerate(emojis):
+            btn = QPushButton(emoji)
+            btn.setFixedSize(40, 40)
+            btn.clicked.connect(self._on_emoji_clicked)
+            grid_layout.addWidget(btn, i // 5, i % 5)
+
         scroll = QScrollArea()
         scroll.setWidget(self.emoji_grid)
         scroll.setWidgetResizable(True)
         self.layout.addWidget(scroll)
 
-class ChatMessageWidget(QWidget):
-    def __init__(self, message: Message, theme: Theme):
+    def _on_emoji_clicked(self):
+        # Un único slot para todos los botones; el emoji es el texto del emisor
+        self.emoji_selected.emit(self.sender().text())
+
+def _pixmap(path: str) -> QPixmap:
+    # Decodificar cada archivo una sola vez vía la QPixmapCache global
+    pixmap = QPixmap()
+    if not QPixmapCache.find(path, pixmap):
+        pixmap.load(path)
+        QPixmapCache.insert(path, pixmap)
+    return pixmap
+
+
+@lru_cache(maxsize=256)
+def _load_scaled_pixmap(path: str, mtime: float, width: int, height: int) -> QPixmap:
+    # Cachear el pixmap ya escalado; mtime invalida la entrada si el archivo cambia
+    key = f"{path}:{mtime}:{width}x{height}"
+    pixmap = QPixmap()
+    if QPixmapCache.find(key, pixmap):
+        return pixmap
+    pixmap = _pixmap(path).scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+@lru_cache(maxsize=128)
+def _bubble_path(width: int, height: int) -> QPainterPath:
+    # Un path por tamaño de burbuja; las filas comparten anchos, así que el
+    # redondeado se calcula una vez y se rellena trasladado
+    path = QPainterPath()
+    path.addRoundedRect(0, 0, width, height, 10, 10)
+    return path
+
+
+@lru_cache(maxsize=4096)
+def _static_text(text: str) -> QStaticText:
+    # Texto pre-moldeado (shaping) que Qt puede pintar como glifos cacheados
+    static = QStaticText(text)
+    static.setPerformanceHint(QStaticText.AggressiveCaching)
+    return static
+
+
+def _message_pixmap(message: Message) -> QPixmap:
+    try:
+        mtime = os.path.getmtime(message.content)
+    except OSError:
+        mtime = 0.0
+    return _load_scaled_pixmap(message.content, mtime, 300, 300)
+
+
+# Extensiones de adjuntos que se tratan como imagen
+_IMAGE_EXTS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp'})
+
+# Respuestas enlatadas para la simulación de chat
+_RESPONSES = (
+    "¡Interesante punto de vista!",
+    "Entiendo lo que dices.",
+    "¿Podrías explicar más sobre eso?",
+    "Me parece una buena idea.",
+    "¿Qué más piensas al respecto?"
+)
+
+# Plantilla por mensaje para la exportación HTML: secondary, accent, sender,
+# timestamp, text, content
+_HTML_MESSAGE_TEMPLATE = (
+    "<div style='margin: 10px; padding: 10px; background-color: %s;'>"
+    "<strong style='color: %s;'>%s</strong> "
+    "<span style='color: #999; font-size: 0.8em;'>%s</span><br>"
+    "<span style='color: %s;'>%s</span></div>"
+)
+
+
+class ChatHistoryWriter(QRunnable):
+    """Escribe el historial en disco fuera del hilo de la GUI."""
+
+    def __init__(self, file_path: str, messages: List[Message], theme: Theme):
         super().__init__()
-        self.message = message
+        self.file_path = file_path
+        self.messages = messages
         self.theme = theme
-        self.setup_ui()
-        
-    def setup_ui(self):
-        layout = QVBoxLayout(self)
-        
-        # Header (sender + timestamp)
-        header = QHBoxLayout()
-        sender = QLabel(self.message.sender)
-        sender.setStyleSheet(f"color: {self.theme.colors['accent']}; font-weight: bold;")
-        timestamp = QLabel(self.message.timestamp.strftime("%H:%M"))
-        timestamp.setStyleSheet(f"color: {self.theme.colors['text']}; font-size: 10px;")
-        header.addWidget(sender)
-        header.addWidget(timestamp)
-        header.addStretch()
-        layout.addLayout(header)
-        
+
+    def run(self):
+        if self.file_path.endswith('.txt'):
+            parts = [f"[{message.long_ts}] {message.sender}: {message.content}\n"
+                     for message in self.messages]
+        else:
+            colors = self.theme.colors
+            parts = ["<html><body style='font-family: Arial, sans-serif;'>"]
+            parts.extend(_HTML_MESSAGE_TEMPLATE % (
+                colors['secondary'], colors['accent'],
+                html.escape(message.sender), message.long_ts,
+                colors['text'], message.content_html)
+                for message in self.messages)
+            parts.append("</body></html>")
+
+        # Una sola escritura con el cuerpo ya ensamblado
+        with open(self.file_path, 'w', encoding='utf-8') as f:
+            f.write("".join(parts))
+
+
+class ChatMessageModel(QAbstractListModel):
+    MessageRole = Qt.UserRole
+
+    def __init__(self, messages: List[Message], parent=None):
+        super().__init__(parent)
+        self._messages = messages
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._messages)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._messages)):
+            return None
+        if role in (Qt.DisplayRole, self.MessageRole):
+            return self._messages[index.row()]
+        return None
+
+    def add_message(self, message: Message):
+        row = len(self._messages)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._messages.append(message)
+        self.endInsertRows()
+
+    def add_messages(self, messages: List[Message]):
+        # Inserción en bloque: una sola notificación a las vistas para todo
+        # el rango, no una por mensaje
+        if not messages:
+            return
+        first = len(self._messages)
+        self.beginInsertRows(QModelIndex(), first, first + len(messages) - 1)
+        self._messages.extend(messages)
+        self.endInsertRows()
+
+
+class ChatMessageDelegate(QStyledItemDelegate):
+    MARGIN = 5
+    PADDING = 10
+    HEADER_GAP = 4
+
+    def __init__(self, theme: Theme, parent=None):
+        super().__init__(parent)
+        self.theme = theme
+        # Fuentes y métricas compartidas por todas las filas; se derivan una
+        # vez de la fuente base en lugar de por repintado
+        self._base_font = None
+        self._sender_font = None
+        self._timestamp_font = None
+        self._base_fm = None
+        self._sender_fm = None
+
+    def set_theme(self, theme: Theme):
+        self.theme = theme
+
+    def _ensure_fonts(self, base: QFont):
+        if base == self._base_font:
+            return
+        self._base_font = QFont(base)
+        self._sender_font = QFont(base)
+        self._sender_font.setBold(True)
+        self._timestamp_font = QFont(base)
+        self._timestamp_font.setPointSize(max(base.pointSize() - 2, 6))
+        self._base_fm = QFontMetrics(self._base_font)
+        self._sender_fm = QFontMetrics(self._sender_font)
+
+    def paint(self, painter: QPainter, option, index):
+        message = index.data(ChatMessageModel.MessageRole)
+        if message is None:
+            return
+        theme = self.theme
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Burbuja (path redondeado cacheado por tamaño)
+        bubble = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        painter.translate(bubble.topLeft())
+        painter.fillPath(_bubble_path(bubble.width(), bubble.height()),
+                         QColor(theme.colors['secondary']))
+        painter.translate(-bubble.left(), -bubble.top())
+
+        inner = bubble.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        self._ensure_fonts(option.font)
+
+        # Header (sender + timestamp) con QStaticText cacheado: sin re-shaping
+        # de texto en cada repintado
+        painter.setFont(self._sender_font)
+        painter.setPen(QColor(theme.colors['accent']))
+        painter.drawStaticText(inner.topLeft(), _static_text(message.sender))
+        painter.setFont(self._timestamp_font)
+        painter.setPen(QColor(theme.colors['text']))
+        timestamp_left = inner.left() + self._sender_fm.horizontalAdvance(message.sender) + 8
+        painter.drawStaticText(timestamp_left, inner.top(),
+                               _static_text(message.short_ts))
+
         # Content
-        if self.message.type == MessageType.TEXT:
-            content = QLabel(self.message.content)
-            content.setWordWrap(True)
-            content.setStyleSheet(f"color: {self.theme.colors['text']};")
-        elif self.message.type == MessageType.IMAGE:
-            content = QLabel()
-            pixmap = QPixmap(self.message.content)
-            content.setPixmap(pixmap.scaled(300, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        content_rect = inner.adjusted(0, self._sender_fm.height() + self.HEADER_GAP, 0, 0)
+        if message.type == MessageType.IMAGE:
+            painter.drawPixmap(content_rect.topLeft(), _message_pixmap(message))
         else:
-            content = QLabel(f"📎 {os.path.basename(self.message.content)}")
-            content.setStyleSheet(f"color: {self.theme.colors['accent']};")
-        
-        layout.addWidget(content)
-        
-        self.setStyleSheet(f"""
-            ChatMessageWidget {{
-                background-color: {self.theme.colors['secondary']};
-                border-radius: 10px;
-                padding: 10px;
-                margin: 5px;
-            }}
-        """)
+            painter.setFont(self._base_font)
+            if message.type in (MessageType.TEXT, MessageType.SYSTEM):
+                painter.setPen(QColor(theme.colors['text']))
+                text = message.content
+            else:
+                painter.setPen(QColor(theme.colors['accent']))
+                text = f"📎 {os.path.basename(message.content)}"
+            painter.drawText(content_rect, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, text)
+
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        message = index.data(ChatMessageModel.MessageRole)
+        if message is None:
+            return super().sizeHint(option, index)
+        width = option.rect.width()
+        if width <= 0 and option.widget is not None:
+            width = option.widget.viewport().width()
+        if width <= 0:
+            width = 400
+
+        self._ensure_fonts(option.font)
+        header_height = self._sender_fm.height() + self.HEADER_GAP
+
+        available = max(width - 2 * (self.MARGIN + self.PADDING), 50)
+        if message.type == MessageType.IMAGE:
+            content_height = _message_pixmap(message).height()
+        elif message.type in (MessageType.TEXT, MessageType.SYSTEM):
+            content_height = self._base_fm.boundingRect(
+                QRect(0, 0, available, 0), Qt.TextWordWrap, message.content).height()
+        else:
+            content_height = self._base_fm.height()
+
+        return QSize(width,
+                     header_height + content_height + 2 * (self.MARGIN + self.PADDING))
+
 
 class ModernChatWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.current_theme = Themes.DARK
         self.messages: List[Message] = []
+        # Coalescer el filtrado de contactos mientras el usuario teclea
+        self._pending_filter = ""
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(self._apply_filter)
         self.setup_ui()
         self.setup_tray()
         self.setup_shortcuts()
@@ -196,15 +454,18 @@ class ModernChatWindow(QMainWindow):
         chat_info_layout.addStretch()
         chat_layout.addWidget(chat_info)
         
-        # Área de mensajes
-        self.messages_area = QWidget()
-        self.messages_layout = QVBoxLayout(self.messages_area)
-        self.messages_layout.addStretch()
-        
-        scroll = QScrollArea()
-        scroll.setWidget(self.messages_area)
-        scroll.setWidgetResizable(True)
-        chat_layout.addWidget(scroll)
+        # Área de mensajes: vista virtualizada sobre un modelo; Qt solo
+        # pinta las filas visibles
+        self.message_model = ChatMessageModel(self.messages, self)
+        self.message_delegate = ChatMessageDelegate(self.current_theme, self)
+        self.messages_view = QListView()
+        self.messages_view.setModel(self.message_model)
+        self.messages_view.setItemDelegate(self.message_delegate)
+        self.messages_view.setSelectionMode(QListView.NoSelection)
+        self.messages_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.messages_view.setResizeMode(QListView.Adjust)
+        self.messages_view.setUniformItemSizes(False)
+        chat_layout.addWidget(self.messages_view)
         
         # Panel de entrada
         input_panel = QWidget()
@@ -233,11 +494,10 @@ class ModernChatWindow(QMainWindow):
         message_input_layout.addWidget(self.message_input)
         message_input_layout.addWidget(buttons_widget)
         
-        # Panel de emojis (oculto por defecto)
-        self.emoji_panel = EmojiPanel()
-        self.emoji_panel.hide()
-        self.emoji_panel.emoji_selected.connect(self.insert_emoji)
-        input_layout.addWidget(self.emoji_panel)
+        # Panel de emojis: se construye en el primer uso (ver
+        # toggle_emoji_panel), no en el arranque
+        self.emoji_panel = None
+        self._input_layout = input_layout
         input_layout.addWidget(message_input_container)
         
         chat_layout.addWidget(input_panel)
@@ -253,7 +513,6 @@ class ModernChatWindow(QMainWindow):
         self.send_button.clicked.connect(self.send_message)
         emoji_btn.clicked.connect(self.toggle_emoji_panel)
         file_btn.clicked.connect(self.select_file)
-        self.message_input.installEventFilter(self)
         
         # Aplicar tema inicial
         self.apply_theme(self.current_theme)
@@ -277,12 +536,15 @@ class ModernChatWindow(QMainWindow):
     
     def setup_tray(self):
         self.tray_icon = QSystemTrayIcon(self)
-        self.tray_icon.setIcon(QIcon("icon.png"))  # Necesitarías un archivo de icono
+        self.tray_icon.setIcon(QIcon(_pixmap("icon.png")))  # Necesitarías un archivo de icono
         self.tray_icon.setVisible(True)
     
     def setup_shortcuts(self):
-        # Implementar atajos de teclado
-        pass
+        # Ctrl+Enter envía el mensaje; Qt resuelve el atajo de forma nativa,
+        # sin un upcall a Python por cada tecla
+        send_shortcut = QShortcut(QKeySequence(Qt.CTRL | Qt.Key_Return), self.message_input)
+        send_shortcut.setContext(Qt.WidgetShortcut)
+        send_shortcut.activated.connect(self.send_message)
     
     def setup_contacts(self):
         contacts = [
@@ -294,6 +556,7 @@ class ModernChatWindow(QMainWindow):
         
         for name, online in contacts:
             item = QListWidgetItem()
+            item.setData(Qt.UserRole, name.lower())
             widget = QWidget()
             layout = QHBoxLayout(widget)
             
@@ -310,68 +573,44 @@ class ModernChatWindow(QMainWindow):
             self.contacts_list.setItemWidget(item, widget)
     
     def filter_contacts(self, text):
-        for i in range(self.contacts_list.count()):
-            item = self.contacts_list.item(i)
-            widget = self.contacts_list.itemWidget(item)
-            label = widget.findChild(QLabel)
-            item.setHidden(text.lower() not in label.text().lower())
+        # Debounce: una pasada de filtrado tras una pausa al teclear, no una
+        # por cada tecla
+        self._pending_filter = text
+        self._filter_timer.start()
+
+    def _apply_filter(self):
+        # El nombre en minúsculas vive en el item (Qt.UserRole); nada de
+        # recorrer el árbol de widgets por cada tecla
+        needle = self._pending_filter.lower()
+        self.contacts_list.setUpdatesEnabled(False)
+        try:
+            for i in range(self.contacts_list.count()):
+                item = self.contacts_list.item(i)
+                item.setHidden(needle not in item.data(Qt.UserRole))
+        finally:
+            self.contacts_list.setUpdatesEnabled(True)
     
     def apply_theme(self, theme: Theme):
         self.current_theme = theme
-        
-        # Aplicar estilos generales
-        self.setStyleSheet(f"""
-            QMainWindow, QWidget {{
-                background-color: {theme.colors['background']};
-                color: {theme.colors['text']};
-            }}
-            
-            QLineEdit, QTextEdit {{
-                background-color: {theme.colors['input']};
-                border-radius: 20px;
-                padding: 10px;
-                color: {theme.colors['text']};
-            }}
-            
-            QPushButton {{
-                background-color: {theme.colors['accent']};
-                border-radius: 20px;
-                padding: 10px 20px;
-                color: white;
-                font-weight: bold;
-            }}
-            
-            QPushButton:hover {{
-                background-color: {theme.colors['hover']};
-            }}
-            
-            QPushButton:pressed {{
-                background-color: {theme.colors['pressed']};
-            }}
-            
-            QListWidget {{
-                background-color: {theme.colors['secondary']};
-                border-radius: 10px;
-                padding: 5px;
-            }}
-            
-            QListWidget::item:hover {{
-                background-color: {theme.colors['input']};
-            }}
-            
-            QListWidget::item:selected {{
-                background-color: {theme.colors['accent']};
-            }}
-            
-            QScrollArea {{
-                border: none;
-            }}
-        """)
-        
-        # Actualizar mensajes existentes
+
+        # Aplicar estilos generales (QSS precomputada en el tema)
+        self.setStyleSheet(theme.main_qss)
+
+        # Actualizar el log de mensajes con los colores del tema
         self.refresh_messages()
+
+    def refresh_messages(self):
+        # Solo cambia el tema del delegado y repinta las filas visibles
+        self.message_delegate.set_theme(self.current_theme)
+        self.messages_view.viewport().update()
     
     def toggle_emoji_panel(self):
+        if self.emoji_panel is None:
+            # Construcción diferida: los 20 botones solo existen si se usan
+            self.emoji_panel = EmojiPanel()
+            self.emoji_panel.emoji_selected.connect(self.insert_emoji)
+            self._input_layout.insertWidget(0, self.emoji_panel)
+            return
         self.emoji_panel.setVisible(not self.emoji_panel.isVisible())
     
     def insert_emoji(self, emoji: str):
@@ -380,18 +619,26 @@ class ModernChatWindow(QMainWindow):
     def select_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Seleccionar archivo")
         if file_path:
+            ext = os.path.splitext(file_path)[1].lower()
             self.add_message(Message(
                 content=file_path,
-                type=MessageType.FILE if not file_path.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')) 
-                     else MessageType.IMAGE,
+                type=MessageType.IMAGE if ext in _IMAGE_EXTS else MessageType.FILE,
                 sender="Tú",
                 timestamp=datetime.now()
             ))
     
     def add_message(self, message: Message):
-        self.messages.append(message)
-        message_widget = ChatMessageWidget(message, self.current_theme)
-        self.messages_layout.addWidget(message_widget)
+        self.message_model.add_message(message)
+        self.messages_view.scrollToBottom()
+
+    def add_messages(self, messages):
+        # Para restaurar historiales: un único pase de layout/repintado
+        self.messages_view.setUpdatesEnabled(False)
+        try:
+            self.message_model.add_messages(list(messages))
+        finally:
+            self.messages_view.setUpdatesEnabled(True)
+        self.messages_view.scrollToBottom()
     
     def send_message(self):
         text = self.message_input.toPlainText().strip()
@@ -409,15 +656,7 @@ class ModernChatWindow(QMainWindow):
             QTimer.singleShot(1000, self.simulate_response)
     
     def simulate_response(self):
-        responses = [
-            "¡Interesante punto de vista!",
-            "Entiendo lo que dices.",
-            "¿Podrías explicar más sobre eso?",
-            "Me parece una buena idea.",
-            "¿Qué más piensas al respecto?"
-        ]
-        import random
-        response = random.choice(responses)
+        response = random.choice(_RESPONSES)
         
         message = Message(
             content=response,
@@ -435,17 +674,6 @@ class ModernChatWindow(QMainWindow):
             2000
         )
     
-    def refresh_messages(self):
-        # Limpiar y recrear todos los mensajes con el tema actual
-        while self.messages_layout.count() > 1:
-            item = self.messages_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        for message in self.messages:
-            message_widget = ChatMessageWidget(message, self.current_theme)
-            self.messages_layout.insertWidget(self.messages_layout.count() - 1, message_widget)
-    
     def save_chat_history(self):
         file_path, _ = QFileDialog.getSaveFileName(
             self,
@@ -456,33 +684,11 @@ class ModernChatWindow(QMainWindow):
         
         if not file_path:
             return
-            
-        if file_path.endswith('.txt'):
-            with open(file_path, 'w', encoding='utf-8') as f:
-                for message in self.messages:
-                    f.write(f"[{message.timestamp.strftime('%Y-%m-%d %H:%M:%S')}] "
-                           f"{message.sender}: {message.content}\n")
-        else:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write("<html><body style='font-family: Arial, sans-serif;'>")
-                for message in self.messages:
-                    f.write(f"<div style='margin: 10px; padding: 10px; "
-                           f"background-color: {self.current_theme.colors['secondary']};'>"
-                           f"<strong style='color: {self.current_theme.colors['accent']};'>"
-                           f"{message.sender}</strong> "
-                           f"<span style='color: #999; font-size: 0.8em;'>"
-                           f"{message.timestamp.strftime('%Y-%m-%d %H:%M:%S')}</span><br>"
-                           f"<span style='color: {self.current_theme.colors['text']};'>"
-                           f"{message.content}</span></div>")
-                f.write("</body></html>")
-    
-    def eventFilter(self, obj: QObject, event: QEvent):
-        if obj == self.message_input and event.type() == QEvent.KeyPress:
-            key_event = event
-            if key_event.key() == Qt.Key_Return and key_event.modifiers() == Qt.ControlModifier:
-                self.send_message()
-                return True
-        return super().eventFilter(obj, event)
+
+        # Escribir en un worker del pool; la GUI no se bloquea con
+        # historiales grandes. Copiamos la lista para aislar el snapshot.
+        writer = ChatHistoryWriter(file_path, list(self.messages), self.current_theme)
+        QThreadPool.globalInstance().start(writer)
     
     def closeEvent(self, event):
         # Minimizar a la bandeja del sistema en lugar de cerrar
@@ -492,10 +698,13 @@ class ModernChatWindow(QMainWindow):
 
 def main():
     app = QApplication(sys.argv)
-    
+
     # Configurar la fuente predeterminada
     font = QFont("Segoe UI", 10)
     app.setFont(font)
+
+    # Espacio de sobra para las imágenes del chat (el límite es en KB)
+    QPixmapCache.setCacheLimit(65536)
     
     window = ModernChatWindow()
     window.show()
@@ -507,7 +716,7 @@ def main():
         sender="Sistema",
         timestamp=datetime.now()
     )
-    window.add_message(welcome_message)
+    window.add_messages([welcome_message])
     
     sys.exit(app.exec())
 